@@ -1,22 +1,46 @@
 """Configuration helpers for the T-730 bot."""
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from dataclasses import dataclass
+from typing import Mapping
 
 from dotenv import load_dotenv
 
 _DEFAULT_COOLDOWN_SECONDS = 30
 _DEFAULT_MAX_VIDEO_DURATION_SECONDS = 10 * 60
-_TRUTHY = {"1", "true", "yes", "on"}
-_FALSY = {"0", "false", "no", "off"}
+_DEFAULT_ADDRADIO_CONCURRENCY = 4
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+_FALSY = frozenset({"0", "false", "no", "off"})
 
+_dotenv_loaded = False
 
-def _int_from_env(name: str) -> int | None:
+
+def _ensure_dotenv_loaded() -> None:
+    """Run ``load_dotenv`` at most once per process.
+
+    Containers inject configuration straight into the environment, so the
+    stat-and-parse of ``.env`` is skipped entirely when the file is absent
+    or when ``T730_SKIP_DOTENV`` is set.
+    """
+
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+
+    if os.environ.get("T730_SKIP_DOTENV", "").strip().lower() in _TRUTHY:
+        return
+    if os.path.exists(".env"):
+        load_dotenv()
+
+
+def _int_from_env(name: str, *, env: Mapping[str, str] | None = None) -> int | None:
     """Return an integer parsed from the environment or ``None`` when absent."""
 
-    raw = os.getenv(name)
+    raw = os.environ.get(name) if env is None else env.get(name)
     if raw is None:
         return None
     try:
@@ -26,10 +50,12 @@ def _int_from_env(name: str) -> int | None:
         return None
 
 
-def _bool_from_env(name: str, *, default: bool) -> bool:
+def _bool_from_env(
+    name: str, *, default: bool, env: Mapping[str, str] | None = None
+) -> bool:
     """Return a boolean parsed from the environment with forgiving semantics."""
 
-    raw = os.getenv(name)
+    raw = os.environ.get(name) if env is None else env.get(name)
     if raw is None:
         return default
 
@@ -43,7 +69,7 @@ def _bool_from_env(name: str, *, default: bool) -> bool:
     return default
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BotConfig:
     """Immutable configuration values loaded from environment variables."""
 
@@ -54,6 +80,7 @@ class BotConfig:
     playlist_url: str | None
     max_video_duration_seconds: int
     cooldown_seconds: int
+    addradio_concurrency: int
     health_host: str
     health_port: int
 
@@ -68,22 +95,32 @@ class BotConfig:
         return None
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> BotConfig:
-    """Load configuration from the environment and provide sane defaults."""
+    """Load configuration from the environment and provide sane defaults.
+
+    The result is memoized: ``BotConfig`` is frozen and the environment is
+    only expected to change between process runs, so repeated callers share
+    a single parse. Tests can reset with ``load_config.cache_clear()``.
+    """
+
+    _ensure_dotenv_loaded()
 
-    load_dotenv()
+    # Snapshot the environment once so each variable below is resolved from a
+    # plain dict instead of hitting os.environ per key.
+    env = os.environ.copy()
 
-    token = os.getenv("DISCORD_TOKEN")
-    channel_id = _int_from_env("CHANNEL_ID")
-    guild_id = _int_from_env("GUILD_ID")
-    playlist_id = os.getenv("PLAYLIST_ID")
-    playlist_url = os.getenv("PLAYLIST_URL")
+    token = env.get("DISCORD_TOKEN")
+    channel_id = _int_from_env("CHANNEL_ID", env=env)
+    guild_id = _int_from_env("GUILD_ID", env=env)
+    playlist_id = env.get("PLAYLIST_ID")
+    playlist_url = env.get("PLAYLIST_URL")
 
-    max_video_duration = _int_from_env("MAX_VIDEO_DURATION_SECONDS")
+    max_video_duration = _int_from_env("MAX_VIDEO_DURATION_SECONDS", env=env)
     if not max_video_duration:
         max_video_duration = _DEFAULT_MAX_VIDEO_DURATION_SECONDS
 
-    raw_cooldown = _int_from_env("ADDRADIO_COOLDOWN_SECONDS")
+    raw_cooldown = _int_from_env("ADDRADIO_COOLDOWN_SECONDS", env=env)
     if raw_cooldown is None:
         cooldown_seconds = _DEFAULT_COOLDOWN_SECONDS
     elif raw_cooldown < 0:
@@ -95,8 +132,15 @@ def load_config() -> BotConfig:
     else:
         cooldown_seconds = raw_cooldown
 
-    health_host = os.getenv("HEALTH_HOST", "0.0.0.0")
-    health_port = _int_from_env("HEALTH_PORT") or 8081
+    raw_concurrency = _int_from_env("ADDRADIO_CONCURRENCY", env=env)
+    if raw_concurrency is None or raw_concurrency < 1:
+        addradio_concurrency = _DEFAULT_ADDRADIO_CONCURRENCY
+    else:
+        addradio_concurrency = raw_concurrency
+
+    health_host = env.get("HEALTH_HOST", "0.0.0.0")
+    raw_health_port = _int_from_env("HEALTH_PORT", env=env)
+    health_port = 8081 if raw_health_port is None else raw_health_port
 
     return BotConfig(
         token=token,
@@ -106,6 +150,7 @@ def load_config() -> BotConfig:
         playlist_url=playlist_url,
         max_video_duration_seconds=max_video_duration,
         cooldown_seconds=cooldown_seconds,
+        addradio_concurrency=addradio_concurrency,
         health_host=health_host,
         health_port=health_port,
     )
@@ -1,18 +1,34 @@
 """Utilities for tracking per-user cooldowns."""
 from __future__ import annotations
 
-import asyncio
+import heapq
 import time
-from typing import Dict
+from typing import Dict, List, Tuple
+
+_monotonic = time.monotonic
 
 
 class CooldownTracker:
-    """Track cooldown windows for users interacting with the bot."""
+    """Track cooldown windows for users interacting with the bot.
+
+    The tracker is intentionally lock-free: it is only touched from the
+    bot's single event-loop thread and its methods never await, so there
+    is no interleaving to protect against. Timestamps use
+    ``time.monotonic`` so wall-clock jumps (NTP, DST) cannot distort the
+    window.
+    """
+
+    __slots__ = ("_cooldown_seconds", "_timestamps", "_expiry_heap")
 
     def __init__(self, cooldown_seconds: int) -> None:
         self._cooldown_seconds = max(0, cooldown_seconds)
         self._timestamps: Dict[int, float] = {}
-        self._lock = asyncio.Lock()
+        # Min-heap of (expiry, user_id, marked_at) paired with _timestamps.
+        # Re-marking a user leaves a stale heap entry behind; the sweep in
+        # mark() recognizes those by comparing marked_at against the live
+        # timestamp and discards them (lazy deletion), so eviction stays
+        # O(log n) per expired entry instead of a periodic full-map rebuild.
+        self._expiry_heap: List[Tuple[float, int, float]] = []
 
     @property
     def enabled(self) -> bool:
@@ -20,29 +36,40 @@ class CooldownTracker:
 
         return self._cooldown_seconds > 0
 
-    async def remaining(self, user_id: int, *, now: float | None = None) -> float:
+    def remaining(self, user_id: int, *, now: float | None = None) -> float:
         """Return the remaining cooldown for ``user_id`` in seconds."""
 
         if not self.enabled:
             return 0.0
 
-        current = time.time() if now is None else now
-        async with self._lock:
-            last = self._timestamps.get(user_id)
-            if last is None:
-                return 0.0
-            remaining = self._cooldown_seconds - (current - last)
+        last = self._timestamps.get(user_id)
+        if last is None:
+            return 0.0
+
+        current = _monotonic() if now is None else now
+        remaining = self._cooldown_seconds - (current - last)
         return remaining if remaining > 0 else 0.0
 
-    async def mark(self, user_id: int, *, now: float | None = None) -> None:
+    def mark(self, user_id: int, *, now: float | None = None) -> None:
         """Record the current time for ``user_id``'s cooldown window."""
 
         if not self.enabled:
             return
 
-        current = time.time() if now is None else now
-        async with self._lock:
-            self._timestamps[user_id] = current
+        current = _monotonic() if now is None else now
+        timestamps = self._timestamps
+        heap = self._expiry_heap
+
+        # Drop everything whose window has closed before recording the new
+        # mark, so long-running bots with many one-shot users do not
+        # accumulate dead timestamps.
+        while heap and heap[0][0] <= current:
+            _expiry, uid, marked_at = heapq.heappop(heap)
+            if timestamps.get(uid) == marked_at:
+                del timestamps[uid]
+
+        timestamps[user_id] = current
+        heapq.heappush(heap, (current + self._cooldown_seconds, user_id, current))
 
 
 __all__ = ["CooldownTracker"]
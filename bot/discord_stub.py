@@ -37,7 +37,7 @@ class Client:
     def __init__(self, *, intents: Optional[Intents] = None) -> None:
         self.intents = intents
         self.loop = _Loop()
-        self._ready = False
+        self._ready_event = asyncio.Event()
         self._events: dict[str, Callable[..., Any]] = {}
         self.user = "discord-stub"
 
@@ -46,7 +46,7 @@ class Client:
         return func
 
     def is_ready(self) -> bool:
-        return self._ready
+        return self._ready_event.is_set()
 
     def get_channel(self, channel_id: int) -> None:  # pragma: no cover - unused
         return None
@@ -55,18 +55,22 @@ class Client:
         return None
 
     async def start(self, token: str) -> None:  # pragma: no cover - unused
-        self._ready = True
+        self._ready_event.set()
 
     def run(self, token: str) -> None:  # pragma: no cover - unused
-        self._ready = True
+        self._ready_event.set()
 
 
 class _Author:
+    __slots__ = ("bot",)
+
     def __init__(self, bot: bool = False) -> None:
         self.bot = bot
 
 
 class _Channel:
+    __slots__ = ("id",)
+
     def __init__(self, channel_id: int = 0) -> None:
         self.id = channel_id
 
@@ -77,6 +81,8 @@ class Message:
     Only the attributes and methods accessed by our bot are provided.
     """
 
+    __slots__ = ("content", "channel", "author")
+
     def __init__(self, content: str = "", channel_id: int = 0, author_is_bot: bool = False) -> None:  # pragma: no cover - helper for tests only
         self.content = content
         self.channel = _Channel(channel_id)
@@ -1,47 +1,58 @@
+import asyncio
+import functools
 import logging
-import math
 import time
 
+log = logging.getLogger(__name__)
+
 try:  # pragma: no cover - exercised indirectly via tests when discord missing
     import discord  # type: ignore
 except Exception as exc:  # pragma: no cover - the fallback itself is tested
-    logging.getLogger(__name__).warning(
+    log.warning(
         "discord import failed (%s); using lightweight stub", exc,
     )
     from . import discord_stub as discord  # type: ignore
 from .config import load_config
 from .cooldown import CooldownTracker
 from .retry import call_with_retry
-from .youtube import add_to_playlist, get_video_metadata, video_exists
-from .youtube import CredentialsExpiredError, MissingGoogleDependenciesError
-try:
-    # discord.py depends on aiohttp; use it for an in-process health endpoint
-    from aiohttp import web  # type: ignore
-except Exception:  # pragma: no cover - only if aiohttp missing at runtime
-    web = None  # type: ignore
+from .youtube import (
+    CredentialsExpiredError,
+    MissingGoogleDependenciesError,
+    credentials_refresh_loop,
+)
 from .youtube.urls import canonical_video_ids_from_text
 
+
+@functools.lru_cache(maxsize=1)
+def _aiohttp_web():
+    """Import and return ``aiohttp.web`` on first use, or ``None`` if missing.
+
+    discord.py depends on aiohttp, but the health server is the only direct
+    consumer here; deferring the import keeps module load (and test
+    collection) fast when the endpoint never starts.
+    """
+
+    try:
+        from aiohttp import web  # type: ignore
+    except Exception:  # pragma: no cover - only if aiohttp missing at runtime
+        return None
+    return web
+
 # Best-effort detection of Discord HTTP errors without tightly coupling to discord.py
 def _is_unknown_interaction_error(exc: Exception) -> bool:
     """Return True if the exception looks like a 10062 Unknown interaction error.
 
-    Works across discord.py versions by checking common attributes and message text.
+    Works across discord.py versions by checking common attributes and message
+    text. The ``.code`` attribute check comes first so the common case never
+    has to stringify the exception.
     """
-    try:
-        # discord.NotFound or HTTPException often carry .code or .status
-        code = getattr(exc, "code", None)
-        status = getattr(getattr(exc, "response", None), "status", None) or getattr(exc, "status", None)
-        message = str(exc)
-        if code == 10062:
-            return True
-        if (status == 404) and ("Unknown interaction" in message or "10062" in message):
-            return True
-        # Some variants embed json with code/message
-        if "Unknown interaction" in message:
-            return True
-    except Exception:
-        pass
-    return False
+
+    # discord.NotFound or HTTPException often carry .code
+    if getattr(exc, "code", None) == 10062:
+        return True
+
+    message = str(exc)
+    return "Unknown interaction" in message or "10062" in message
 
 async def _safe_followup_send(
     interaction,
@@ -53,7 +64,8 @@ async def _safe_followup_send(
     """Attempt to reply to an interaction while hiding Discord's thinking state."""
 
     try:
-        if getattr(interaction, "response", None) and interaction.response.is_done():
+        response = getattr(interaction, "response", None)
+        if response is not None and response.is_done():
             try:
                 if embed is not None:
                     await interaction.edit_original_response(content=content, embed=embed)
@@ -61,17 +73,16 @@ async def _safe_followup_send(
                     await interaction.edit_original_response(content=content)
                 return
             except Exception:
-                logging.debug("edit_original_response failed; will try followup", exc_info=True)
-
-        if getattr(interaction, "response", None) and not interaction.response.is_done():
+                log.debug("edit_original_response failed; will try followup", exc_info=True)
+        elif response is not None:
             if embed is not None:
-                await interaction.response.send_message(
+                await response.send_message(
                     content=content,
                     ephemeral=ephemeral,
                     embed=embed,
                 )
             else:
-                await interaction.response.send_message(content, ephemeral=ephemeral)
+                await response.send_message(content, ephemeral=ephemeral)
             return
 
         if embed is not None:
@@ -80,7 +91,7 @@ async def _safe_followup_send(
             await interaction.followup.send(content, ephemeral=ephemeral)
     except Exception as exc:
         if _is_unknown_interaction_error(exc):
-            logging.debug("Interaction response token expired; falling back to channel")
+            log.debug("Interaction response token expired; falling back to channel")
             try:
                 ch = await _resolve_channel_for_interaction(interaction)
                 if ch is not None:
@@ -90,11 +101,10 @@ async def _safe_followup_send(
                         await ch.send(content or "")
                     return
             except Exception:
-                logging.debug("Channel fallback after Unknown interaction failed", exc_info=True)
+                log.debug("Channel fallback after Unknown interaction failed", exc_info=True)
             return
         raise
 
-logging.basicConfig(level=logging.INFO)
 CONFIG = load_config()
 
 TOKEN = CONFIG.token
@@ -110,11 +120,28 @@ bot = discord.Client(intents=intents)
 app_commands = getattr(discord, "app_commands", None)
 tree = app_commands.CommandTree(bot) if app_commands else None
 
-START_TIME = time.time()
-_health_started = False
+# Resolve optional discord attributes once; the stub lacks some of these and
+# per-call getattr in the add path is wasted work.
+_Embed = getattr(discord, "Embed", None)
+_DiscordObject = getattr(discord, "Object", None)
+
+# Interval clock: uptime must not jump with NTP/DST wall-clock changes.
+START_TIME = time.monotonic()
 MAX_VIDEO_DURATION_SECONDS = CONFIG.max_video_duration_seconds
 _cooldowns = CooldownTracker(CONFIG.cooldown_seconds)
 
+# Bound worst-case API cost when someone pastes a wall of links.
+MAX_VIDEOS_PER_COMMAND = 10
+
+# Cap how many playlist inserts may be in flight at once so a multi-link
+# submission overlaps its YouTube round-trips without hammering the quota.
+_api_semaphore = asyncio.Semaphore(CONFIG.addradio_concurrency)
+
+# Static embed styling, hoisted out of the per-video builder.
+_EMBED_COLOR = 0x2ECC71
+
+
+@functools.lru_cache(maxsize=1024)
 def _format_duration(total_seconds: int) -> str:
     h, rem = divmod(max(0, int(total_seconds)), 3600)
     m, s = divmod(rem, 60)
@@ -125,15 +152,14 @@ def _format_duration(total_seconds: int) -> str:
 
 def _build_video_embed(meta: dict):
     """Return a discord.Embed for the added video, or None if unsupported."""
-    Embed = getattr(discord, "Embed", None)
-    if Embed is None:
+    if _Embed is None:
         return None
     title = meta.get("title") or meta.get("id")
     url = meta.get("url")
     channel = meta.get("channel_title") or ""
     duration_s = int(meta.get("duration_seconds") or 0)
     duration = _format_duration(duration_s)
-    embed = Embed(title=title, url=url, color=0x2ecc71)
+    embed = _Embed(title=title, url=url, color=_EMBED_COLOR)
     if channel:
         embed.set_author(name=channel)
     embed.add_field(name="Duration", value=duration, inline=True)
@@ -151,16 +177,19 @@ def _format_added_line(meta: dict) -> str:
     return f"Added: {title} — {channel} ({duration})"
 
 
+# The playlist link never changes at runtime; bake the trailing line once so
+# each announcement is a single concatenation.
+_PLAYLIST_URL_SUFFIX = (
+    f"\nListen to the playlist: {PLAYLIST_URL}" if PLAYLIST_URL else ""
+)
+
+
 def _build_announcement_content(content_prefix: str | None, line: str) -> str:
     """Compose the public success message content."""
 
-    parts: list[str] = []
     if content_prefix:
-        parts.append(content_prefix)
-    parts.append(line)
-    if PLAYLIST_URL:
-        parts.append(f"Listen to the playlist: {PLAYLIST_URL}")
-    return "\n".join(parts)
+        return f"{content_prefix}\n{line}{_PLAYLIST_URL_SUFFIX}"
+    return line + _PLAYLIST_URL_SUFFIX
 
 
 async def _announce_added(
@@ -187,7 +216,7 @@ async def _announce_added(
                 await channel.send(content)
             return
     except Exception:
-        logging.exception("Failed to post in channel; will try fallback")
+        log.exception("Failed to post in channel; will try fallback")
 
     # Fallback path if channel was None or send failed
     try:
@@ -198,7 +227,7 @@ async def _announce_added(
     except Exception as exc:
         # Swallow Unknown interaction errors (token expired) to avoid noisy exceptions
         if _is_unknown_interaction_error(exc):
-            logging.debug("Fallback sender hit Unknown interaction; suppressing")
+            log.debug("Fallback sender hit Unknown interaction; suppressing")
             return
         raise
 
@@ -215,26 +244,31 @@ async def _resolve_channel_for_interaction(interaction):
         try:
             return bot.get_channel(CHANNEL_ID) or await bot.fetch_channel(CHANNEL_ID)
         except Exception:
-            logging.debug("Failed to fetch fallback channel", exc_info=True)
+            log.debug("Failed to fetch fallback channel", exc_info=True)
     return None
 
 
-async def _get_cooldown_remaining(user_id: int, *, now: float | None = None) -> float:
-    """Return the remaining cooldown in seconds for ``user_id``."""
+def _get_cooldown_remaining(user_id: int, *, now: float | None = None) -> int:
+    """Return the remaining cooldown for ``user_id`` in whole seconds.
+
+    Rounded up, so any non-zero remainder reports at least one second.
+    """
 
     if not _cooldowns.enabled:
-        return 0.0
+        return 0
 
-    return await _cooldowns.remaining(user_id, now=now)
+    remaining = _cooldowns.remaining(user_id, now=now)
+    seconds = int(remaining)
+    return seconds + 1 if remaining > seconds else seconds
 
 
-async def _mark_cooldown(user_id: int, *, now: float | None = None) -> None:
+def _mark_cooldown(user_id: int, *, now: float | None = None) -> None:
     """Record the current timestamp for ``user_id``'s cooldown."""
 
     if not _cooldowns.enabled:
         return
 
-    await _cooldowns.mark(user_id, now=now)
+    _cooldowns.mark(user_id, now=now)
 
 
 async def _start_health_server() -> None:
@@ -244,18 +278,33 @@ async def _start_health_server() -> None:
     Uses aiohttp if available via discord.py dependency.
     """
 
+    web = _aiohttp_web()
     if web is None:
-        logging.warning("Health server unavailable: aiohttp not importable")
+        log.warning("Health server unavailable: aiohttp not importable")
         return
 
     app = web.Application()
 
+    # Orchestrators poll this endpoint constantly; assemble the tiny JSON
+    # payload from a static prefix and reuse it for up to a second, since
+    # uptime is reported at second granularity anyway.
+    body_prefix = b'{"status":"ok","ready":'
+    cached_body = b""
+    cached_until = 0.0
+
     async def health(_request):
-        return web.json_response({
-            "status": "ok",
-            "ready": bot.is_ready(),
-            "uptime_s": int(time.time() - START_TIME),
-        })
+        nonlocal cached_body, cached_until
+        now = time.monotonic()
+        if now >= cached_until:
+            cached_body = (
+                body_prefix
+                + (b"true" if bot.is_ready() else b"false")
+                + b',"uptime_s":'
+                + str(int(now - START_TIME)).encode()
+                + b"}"
+            )
+            cached_until = now + 1.0
+        return web.Response(body=cached_body, content_type="application/json")
 
     app.add_routes([web.get("/healthz", health), web.get("/", health)])
 
@@ -265,41 +314,32 @@ async def _start_health_server() -> None:
     await runner.setup()
     site = web.TCPSite(runner, host=host, port=port)
     await site.start()
-    logging.info("Health server started on http://%s:%s/healthz", host, port)
+    log.info("Health server started on http://%s:%s/healthz", host, port)
 
 @bot.event
 async def on_ready():
-    global _health_started
-    logging.info(f"Logged in as {bot.user}")
-
-    # Start health endpoint once
-    if not _health_started:
-        try:
-            bot.loop.create_task(_start_health_server())
-            _health_started = True
-        except Exception:
-            logging.exception("Failed to start health server")
+    log.info("Logged in as %s", bot.user)
 
     health_port = CONFIG.health_port
-    logging.info("READY playlist=%s channel=%s health=http://localhost:%s/healthz",
+    log.info("READY playlist=%s channel=%s health=http://localhost:%s/healthz",
                  PLAYLIST, CHANNEL_ID, health_port)
 
     # Sync slash commands
     if tree is not None:
         try:
             if GUILD_ID:
-                guild_obj = discord.Object(id=GUILD_ID)
+                guild_obj = _DiscordObject(id=GUILD_ID)
                 try:
                     tree.copy_global_to(guild=guild_obj)
                 except Exception:
-                    logging.debug("copy_global_to failed (maybe no globals yet)", exc_info=True)
+                    log.debug("copy_global_to failed (maybe no globals yet)", exc_info=True)
                 await tree.sync(guild=guild_obj)
-                logging.info("Slash commands synced to guild %s", GUILD_ID)
+                log.info("Slash commands synced to guild %s", GUILD_ID)
             else:
                 await tree.sync()
-                logging.info("Slash commands synced globally")
+                log.info("Slash commands synced globally")
         except Exception:
-            logging.exception("Failed to sync slash commands")
+            log.exception("Failed to sync slash commands")
 
     # Ready announcement intentionally removed to avoid extra noise in the channel
 
@@ -308,6 +348,11 @@ if tree is not None:
     @tree.command(name="addradio", description="Add a YouTube video to the playlist")
     @app_commands.describe(url="YouTube URL")
     async def addradio(interaction, url: str):
+        # Imported on first command use; bot.youtube defers the Google client
+        # libraries itself, so module import stays cheap until someone adds.
+        from .youtube import add_to_playlist, get_videos_metadata
+        from .youtube.playlist_cache import get_playlist_video_ids, record_added
+
         try:
             # Restrict to configured channel if set
             if CHANNEL_ID is not None and getattr(interaction, "channel_id", None) != CHANNEL_ID:
@@ -316,12 +361,18 @@ if tree is not None:
                 )
                 return
 
+            # Bind user attributes once up front instead of re-walking the
+            # interaction object later in the function.
             user = getattr(interaction, "user", None)
             user_id = getattr(user, "id", None)
+            user_mention = (
+                getattr(user, "mention", None)
+                or getattr(user, "name", None)
+                or "someone"
+            )
             if user_id is not None:
-                remaining = await _get_cooldown_remaining(user_id)
-                if remaining > 0:
-                    wait_seconds = max(1, math.ceil(remaining))
+                wait_seconds = _get_cooldown_remaining(user_id)
+                if wait_seconds > 0:
                     await interaction.response.send_message(
                         "Please wait "
                         f"{wait_seconds} more seconds before adding more songs. "
@@ -331,106 +382,147 @@ if tree is not None:
                     )
                     return
 
-            # Defer early to allow slower YouTube API calls, but do it silently
-            # (no visible "thinking…" message) to avoid double confirmations.
-            await interaction.response.defer(ephemeral=True)
-
-            vids = canonical_video_ids_from_text(url)
+            # Parse locally before deferring: rejecting a malformed URL needs
+            # no YouTube calls, so it can answer directly without paying the
+            # defer round-trip to Discord.
+            # The parser already deduplicates, but guarantee it here before
+            # any API spend, and cap how many links one command may process.
+            vids = list(dict.fromkeys(canonical_video_ids_from_text(url)))
+            vids = vids[:MAX_VIDEOS_PER_COMMAND]
             if not vids:
-                await _safe_followup_send(
-                    interaction,
+                await interaction.response.send_message(
                     "No valid YouTube video URL found.", ephemeral=True
                 )
                 return
 
+            # Defer to allow slower YouTube API calls, but do it silently
+            # (no visible "thinking…" message) to avoid double confirmations.
+            await interaction.response.defer(ephemeral=True)
+
             if user_id is not None:
-                await _mark_cooldown(user_id)
+                _mark_cooldown(user_id)
 
-            user_mention = (
-                getattr(user, "mention", None)
-                or getattr(user, "name", None)
-                or "someone"
-            )
             content_prefix = f"Song added by {user_mention}"
             channel = await _resolve_channel_for_interaction(interaction)
 
+            # Fetch the playlist's membership set once (cached briefly across
+            # invocations) so duplicate checks are set lookups, then one
+            # videos.list round-trip covers metadata for every new ID.
+            existing_ids = await get_playlist_video_ids(PLAYLIST)
+            new_vids = [vid for vid in vids if vid not in existing_ids]
+            metas = (
+                await call_with_retry(
+                    get_videos_metadata,
+                    new_vids,
+                    description=f"fetch metadata for {len(new_vids)} video(s)",
+                )
+                if new_vids
+                else {}
+            )
+
             added: list[tuple[str, str]] = []
             duplicates: list[str] = []
             too_long: list[tuple[str, str]] = []
             failures: list[tuple[str, str]] = []
 
-            for vid in vids:
-                try:
-                    if await call_with_retry(
-                        video_exists,
-                        vid,
-                        PLAYLIST,
-                        description=f"check playlist for {vid}",
-                    ):
-                        duplicates.append(vid)
-                        continue
+            max_duration = MAX_VIDEO_DURATION_SECONDS
 
-                    meta = await call_with_retry(
-                        get_video_metadata,
-                        vid,
-                        description=f"fetch metadata for {vid}",
-                    )
-                    title = meta.get("title") or vid
+            async def _process_one(vid: str) -> tuple[str, str, str | None]:
+                """Run the gate/insert/announce pipeline for one video."""
+
+                if vid in existing_ids:
+                    return ("duplicate", vid, None)
 
-                    if int(meta.get("duration_seconds", 0)) > MAX_VIDEO_DURATION_SECONDS:
-                        too_long.append((vid, title))
-                        continue
+                meta = metas.get(vid)
+                if meta is None:
+                    return ("failed", vid, "video not found or unavailable")
+                title = meta.get("title") or vid
 
+                if meta.get("duration_seconds", 0) > max_duration:
+                    return ("too_long", vid, title)
+
+                async with _api_semaphore:
                     await call_with_retry(
                         add_to_playlist,
                         vid,
                         PLAYLIST,
                         description=f"add video {vid}",
                     )
+                # Keep the membership cache accurate for our own insert so a
+                # quick follow-up submission sees it without a re-crawl.
+                record_added(PLAYLIST, vid)
+
+                await _announce_added(
+                    meta=meta,
+                    content_prefix=content_prefix,
+                    channel=channel,
+                    fallback_sender=interaction.followup.send,
+                )
 
-                    await _announce_added(
-                        meta=meta,
-                        content_prefix=content_prefix,
-                        channel=channel,
-                        fallback_sender=interaction.followup.send,
-                    )
+                return ("added", vid, title)
 
-                    added.append((vid, title))
-                except MissingGoogleDependenciesError as e:
-                    await _safe_followup_send(interaction, str(e), ephemeral=True)
-                    return
-                except CredentialsExpiredError as e:
-                    await _safe_followup_send(interaction, str(e), ephemeral=True)
-                    return
+            # Process all videos concurrently; gather preserves input order,
+            # so the summary below still follows the submitted order. The
+            # common single-link case skips the gather machinery entirely.
+            if len(vids) == 1:
+                try:
+                    outcomes: list = [await _process_one(vids[0])]
                 except Exception as exc:
-                    logging.exception("Couldn't add video via slash command: %s", vid)
-                    failures.append((vid, str(exc)))
+                    outcomes = [exc]
+            else:
+                outcomes = await asyncio.gather(
+                    *(_process_one(vid) for vid in vids), return_exceptions=True
+                )
+
+            for vid, outcome in zip(vids, outcomes):
+                if isinstance(
+                    outcome,
+                    (MissingGoogleDependenciesError, CredentialsExpiredError),
+                ):
+                    await _safe_followup_send(interaction, str(outcome), ephemeral=True)
+                    return
+                if isinstance(outcome, BaseException):
+                    log.error(
+                        "Couldn't add video via slash command: %s",
+                        vid,
+                        exc_info=outcome,
+                    )
+                    failures.append((vid, str(outcome)))
+                    continue
+
+                tag, _vid, payload = outcome
+                if tag == "duplicate":
+                    duplicates.append(vid)
+                elif tag == "too_long":
+                    too_long.append((vid, payload or vid))
+                elif tag == "failed":
+                    failures.append((vid, payload or "unknown error"))
+                else:
+                    added.append((vid, payload or vid))
 
-            summary_parts: list[str] = []
+            # Build the summary in one buffer with a single join instead of a
+            # nested join per section plus a final join over the sections.
+            buf: list[str] = []
             if added:
-                added_lines = "\n".join(
-                    f"• {title} (`{vid}`)" for vid, title in added
-                )
-                summary_parts.append("Added to the playlist:\n" + added_lines)
+                buf.append("Added to the playlist:")
+                buf.extend(f"\n• {title} (`{vid}`)" for vid, title in added)
             if duplicates:
-                duplicate_lines = "\n".join(f"• `{vid}`" for vid in duplicates)
-                summary_parts.append("Already in the playlist:\n" + duplicate_lines)
+                buf.append(
+                    "\n\nAlready in the playlist:" if buf else "Already in the playlist:"
+                )
+                buf.extend(f"\n• `{vid}`" for vid in duplicates)
             if too_long:
-                too_long_lines = "\n".join(
-                    f"• {title} (`{vid}`)" for vid, title in too_long
+                buf.append(
+                    "\n\nToo long (>10 minutes):" if buf else "Too long (>10 minutes):"
                 )
-                summary_parts.append("Too long (>10 minutes):\n" + too_long_lines)
+                buf.extend(f"\n• {title} (`{vid}`)" for vid, title in too_long)
             if failures:
-                failure_lines = "\n".join(
-                    f"• `{vid}` — {error}" for vid, error in failures
-                )
-                summary_parts.append("Failed to add:\n" + failure_lines)
-            if not summary_parts:
-                summary_parts.append("No videos were processed.")
+                buf.append("\n\nFailed to add:" if buf else "Failed to add:")
+                buf.extend(f"\n• `{vid}` — {error}" for vid, error in failures)
 
             await _safe_followup_send(
                 interaction,
-                "\n\n".join(summary_parts),
+                "".join(buf) or "No videos were processed.",
                 ephemeral=True,
             )
         except MissingGoogleDependenciesError as e:
@@ -438,12 +530,34 @@ if tree is not None:
         except CredentialsExpiredError as e:
             await _safe_followup_send(interaction, str(e), ephemeral=True)
         except Exception as e:
-            logging.exception("Couldn't add video via slash command: %s", url)
+            log.exception("Couldn't add video via slash command: %s", url)
             # Try to inform the user; suppress Unknown interaction error
             try:
                 await _safe_followup_send(interaction, f"Couldn't add video: {e}", ephemeral=True)
             except Exception:
-                logging.debug("Failed to notify user about error", exc_info=True)
+                log.debug("Failed to notify user about error", exc_info=True)
+
+async def _main() -> None:
+    """Start the health endpoint, then connect to Discord.
+
+    Liveness must not depend on the gateway handshake: /healthz answers
+    (with ready=false) while the bot is still connecting and keeps serving
+    across gateway reconnects.
+    """
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        await _start_health_server()
+    except Exception:
+        log.exception("Failed to start health server")
+    # Held for the life of bot.start(); pre-refreshes OAuth tokens so no
+    # command pays the refresh round-trip.
+    refresher = asyncio.create_task(credentials_refresh_loop())
+    try:
+        await bot.start(TOKEN)
+    finally:
+        refresher.cancel()
+
 
 if __name__ == "__main__":
-    bot.run(TOKEN)
+    asyncio.run(_main())
@@ -2,24 +2,65 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import random
 from typing import Any, Callable, TypeVar
 
 from .youtube import CredentialsExpiredError, MissingGoogleDependenciesError
 
 _T = TypeVar("_T")
 
-_FAST_RETRY_DELAY_SECONDS = 5
-_FAST_RETRY_ATTEMPTS = 10
-_SLOW_RETRY_DELAYS = (60, 300, 600)
-RETRY_WAIT_SECONDS: tuple[int, ...] = (
-    (0,) + (_FAST_RETRY_DELAY_SECONDS,) * _FAST_RETRY_ATTEMPTS + _SLOW_RETRY_DELAYS
+# Exponential backoff: immediate first try, then doubling delays. Transient
+# API hiccups clear within the first few retries, while the schedule backs
+# off quickly during a real outage instead of hammering at a flat interval.
+# Worst case ~2 minutes of waiting across 8 attempts (down from ~16 minutes
+# over 14 flat-schedule attempts).
+_BACKOFF_BASE_SECONDS = 1
+_BACKOFF_RETRIES = 7
+RETRY_WAIT_SECONDS: tuple[int, ...] = (0,) + tuple(
+    _BACKOFF_BASE_SECONDS * 2 ** n for n in range(_BACKOFF_RETRIES)
 )
 _NON_RETRYABLE_EXCEPTIONS = (
     CredentialsExpiredError,
     MissingGoogleDependenciesError,
 )
 
+# HTTP statuses that indicate a permanent problem with the request itself
+# (bad input, missing resource); retrying cannot change the answer.
+_NON_RETRYABLE_STATUSES = frozenset({400, 404})
+
+
+def _is_permanent_http_error(exc: BaseException) -> bool:
+    """Return True when ``exc`` (or its cause) is a permanent HTTP failure.
+
+    The YouTube helpers wrap ``HttpError`` in ``RuntimeError`` with the
+    original as ``__cause__``, so the chain is walked looking for a
+    ``resp.status`` attribute.
+    """
+
+    seen = 0
+    current: BaseException | None = exc
+    while current is not None and seen < 8:
+        status = getattr(getattr(current, "resp", None), "status", None)
+        if status in _NON_RETRYABLE_STATUSES:
+            return True
+        current = current.__cause__
+        seen += 1
+    return False
+
+logger = logging.getLogger(__name__)
+
+# Precomputed at import so the retry loop does no enumerate/len work per call.
+_RETRY_SCHEDULE: tuple[tuple[int, int], ...] = tuple(
+    enumerate(RETRY_WAIT_SECONDS, start=1)
+)
+_TOTAL_ATTEMPTS = len(RETRY_WAIT_SECONDS)
+
+# Memoized per callable so repeat calls skip the inspection; lets helpers
+# migrate to ``async def`` without paying the thread-pool dispatch.
+_is_coroutine_function = functools.lru_cache(maxsize=64)(asyncio.iscoroutinefunction)
+
 
 async def call_with_retry(
     func: Callable[..., _T],
@@ -30,35 +71,43 @@ async def call_with_retry(
     """Execute ``func`` with retries and return its eventual result."""
 
     desc = description or getattr(func, "__name__", "operation")
-    total_attempts = len(RETRY_WAIT_SECONDS)
     last_exc: BaseException | None = None
 
-    for attempt, wait_seconds in enumerate(RETRY_WAIT_SECONDS, start=1):
-        if attempt > 1 and wait_seconds:
-            logging.info(
-                "Retrying %s in %s seconds (attempt %s/%s)",
-                desc,
-                wait_seconds,
-                attempt,
-                total_attempts,
-            )
-            await asyncio.sleep(wait_seconds)
+    for attempt, wait_seconds in _RETRY_SCHEDULE:
+        if wait_seconds:
+            # Jitter desynchronizes callers that fail at the same instant so
+            # their retries don't land on the API in lockstep.
+            delay = wait_seconds * random.uniform(0.75, 1.25)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Retrying %s in %.1f seconds (attempt %s/%s)",
+                    desc,
+                    delay,
+                    attempt,
+                    _TOTAL_ATTEMPTS,
+                )
+            await asyncio.sleep(delay)
 
         try:
+            if _is_coroutine_function(func):
+                return await func(*args, **kwargs)
             return await asyncio.to_thread(func, *args, **kwargs)
         except _NON_RETRYABLE_EXCEPTIONS:
             raise
         except Exception as exc:  # pragma: no cover - exercised via tests
+            if _is_permanent_http_error(exc):
+                raise
             last_exc = exc
-            if attempt == total_attempts:
+            if attempt == _TOTAL_ATTEMPTS:
                 break
-            logging.warning(
-                "Attempt %s/%s for %s failed: %s",
-                attempt,
-                total_attempts,
-                desc,
-                exc,
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Attempt %s/%s for %s failed: %s",
+                    attempt,
+                    _TOTAL_ATTEMPTS,
+                    desc,
+                    exc,
+                )
 
     assert last_exc is not None  # We only exit loop on failure
     raise last_exc
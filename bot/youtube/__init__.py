@@ -5,10 +5,16 @@ This module expects OAuth credentials stored at ``data/creds.json`` by
 """
 
 from __future__ import annotations
+import asyncio
+import datetime
+import functools
+import logging
 import os
 import re
+import threading
+import time
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING, Any
+from typing import Optional, Sequence, TYPE_CHECKING, Any
 
 if TYPE_CHECKING:  # pragma: no cover - import only for type checkers
     from google.auth.transport.requests import Request as _Request
@@ -46,12 +52,18 @@ class MissingGoogleDependenciesError(RuntimeError):
         )
 
 
+_DEPS_READY = False
+
+
 def _ensure_google_dependencies() -> None:
     """Import google-api-python-client pieces lazily with friendly errors."""
 
-    global Request, Credentials, build, HttpError, RefreshError, _GOOGLE_IMPORT_ERROR
+    global Request, Credentials, build, HttpError, RefreshError
+    global _GOOGLE_IMPORT_ERROR, _DEPS_READY
 
-    if build is not None and Credentials is not None and Request is not None:
+    # Single-flag fast path: one load and branch instead of three global
+    # attribute checks per call.
+    if _DEPS_READY:
         return
 
     if _GOOGLE_IMPORT_ERROR is not None:
@@ -72,6 +84,7 @@ def _ensure_google_dependencies() -> None:
     build = _build
     HttpError = _HttpError
     RefreshError = _RefreshError
+    _DEPS_READY = True
 
 
 def _data_path(filename: str) -> Path:
@@ -99,54 +112,280 @@ def _reauth_hint() -> str:
     )
 
 
+def _write_credentials_file(creds_path: Path, payload: str) -> None:
+    """Persist serialized credentials atomically, skipping no-op writes.
+
+    A plain write_text can leave a truncated file if the process dies
+    mid-write, which breaks every later start until re-auth. Write to a
+    sibling temp file and os.replace it into place; skip entirely when the
+    bytes are unchanged (google-auth can return a same-token refresh).
+    """
+
+    try:
+        if creds_path.read_text() == payload:
+            return
+    except OSError:
+        pass
+
+    tmp_path = creds_path.with_suffix(".json.tmp")
+    tmp_path.write_text(payload)
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, creds_path)
+
+
+# Parsed Credentials keyed by the file's mtime: (path, st_mtime_ns, creds).
+# Invalidated automatically when the file changes (e.g. re-auth rewrote it).
+_CREDS_CACHE: tuple[str, int, Any] | None = None
+_CREDS_LOCK = threading.Lock()
+
+
 def _load_credentials() -> Credentials:
     """Load user credentials from disk and refresh if needed.
 
-    Raises a clear error if credentials are missing, instructing how to create
-    them via the auth helper.
+    Parsed credentials are cached keyed by the file's mtime, so repeat
+    calls skip the read-and-JSON-parse unless the file changed on disk.
+    Raises a clear error if credentials are missing, instructing how to
+    create them via the auth helper.
     """
 
+    global _CREDS_CACHE
+
     _ensure_google_dependencies()
     assert Credentials is not None  # narrow type after lazy import
 
     creds_path = _data_path("creds.json")
-    if not creds_path.exists():
+    try:
+        mtime_ns = creds_path.stat().st_mtime_ns
+    except FileNotFoundError:
         raise RuntimeError(
             f"Missing credentials at {creds_path}. Run: python -m bot.youtube.auth",
-        )
+        ) from None
+
+    path_str = str(creds_path)
+    with _CREDS_LOCK:
+        cached = _CREDS_CACHE
+        if (
+            cached is not None
+            and cached[0] == path_str
+            and cached[1] == mtime_ns
+        ):
+            creds = cached[2]
+        else:
+            creds = Credentials.from_authorized_user_file(path_str, scopes=SCOPES)
+            _CREDS_CACHE = (path_str, mtime_ns, creds)
+
+        # Refresh if expired and refresh_token is present
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+            except RefreshError as e:
+                raise CredentialsExpiredError(_reauth_hint()) from e
+            # Persist the refreshed token and re-key the cache to the new file
+            _write_credentials_file(creds_path, creds.to_json())
+            _CREDS_CACHE = (path_str, creds_path.stat().st_mtime_ns, creds)
 
-    creds = Credentials.from_authorized_user_file(str(creds_path), scopes=SCOPES)
+    return creds
+
+
+logger = logging.getLogger(__name__)
+
+# Pre-refresh credentials this long before their expiry so no command ever
+# pays the refresh round-trip.
+_REFRESH_MARGIN_SECONDS = 300.0
+# Fallback poll interval when expiry is unknown or a refresh attempt failed.
+_REFRESH_RETRY_SECONDS = 1800.0
 
-    # Refresh if expired and refresh_token is present
-    if creds and creds.expired and creds.refresh_token:
-        try:
-            creds.refresh(Request())
-        except RefreshError as e:
-            raise CredentialsExpiredError(_reauth_hint()) from e
-        # Persist the refreshed token
-        creds_path.write_text(creds.to_json())
 
+def _refresh_credentials_if_near_expiry():
+    """Load credentials, refreshing proactively when expiry is close.
+
+    Runs on a worker thread from :func:`credentials_refresh_loop`. Returns
+    the (possibly refreshed) credentials so the loop can schedule its next
+    wakeup from their expiry.
+    """
+
+    global _CREDS_CACHE
+
+    creds = _load_credentials()
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None or not getattr(creds, "refresh_token", None):
+        return creds
+
+    remaining = (expiry - datetime.datetime.utcnow()).total_seconds()
+    if remaining > _REFRESH_MARGIN_SECONDS:
+        return creds
+
+    try:
+        creds.refresh(Request())
+    except RefreshError as e:
+        raise CredentialsExpiredError(_reauth_hint()) from e
+
+    creds_path = _data_path("creds.json")
+    _write_credentials_file(creds_path, creds.to_json())
+    with _CREDS_LOCK:
+        _CREDS_CACHE = (str(creds_path), creds_path.stat().st_mtime_ns, creds)
     return creds
 
 
-def _get_service():
-    """Build and return an authorized YouTube Data API client."""
+async def credentials_refresh_loop() -> None:
+    """Keep OAuth credentials fresh from a background task.
+
+    ``_load_credentials`` refreshes on demand, which lands the refresh
+    latency on whichever command happens to hit the expired token. This
+    loop wakes shortly before expiry and refreshes proactively instead.
+    Failures (including missing google dependencies in dev environments)
+    are logged and retried later rather than crashing the bot.
+    """
+
+    while True:
+        delay = _REFRESH_RETRY_SECONDS
+        try:
+            creds = await asyncio.to_thread(_refresh_credentials_if_near_expiry)
+            expiry = getattr(creds, "expiry", None)
+            if expiry is not None:
+                remaining = (
+                    expiry - datetime.datetime.utcnow()
+                ).total_seconds()
+                delay = max(60.0, remaining - _REFRESH_MARGIN_SECONDS)
+        except (MissingGoogleDependenciesError, CredentialsExpiredError) as exc:
+            logger.debug("Credential pre-refresh unavailable: %s", exc)
+        except Exception:
+            logger.exception("Credential pre-refresh failed; will retry")
+        await asyncio.sleep(delay)
+
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def _invalidate_service() -> None:
+    """Drop the cached client so the next call rebuilds with fresh creds."""
+
+    global _SERVICE
+    _SERVICE = None
+
+
+def _build_service():
+    """Construct an authorized YouTube Data API client.
+
+    When the transport pieces are available, requests go through an
+    AuthorizedHttp whose user agent advertises gzip, so the API compresses
+    response bodies (playlist pages compress to a fraction of their size).
+    """
 
     _ensure_google_dependencies()
     assert build is not None  # for type checkers after lazy import
     creds = _load_credentials()
-    # Avoid discovery cache writes inside containers
-    return build("youtube", "v3", credentials=creds, cache_discovery=False)
+
+    try:
+        import httplib2  # type: ignore
+        from google_auth_httplib2 import AuthorizedHttp  # type: ignore
+        from googleapiclient.http import set_user_agent  # type: ignore
+    except Exception:  # pragma: no cover - transport extras missing
+        # Avoid discovery cache writes inside containers
+        return build(
+            "youtube",
+            "v3",
+            credentials=creds,
+            cache_discovery=False,
+            static_discovery=True,
+        )
+
+    # One shared transport: the singleton client keeps its TCP/TLS
+    # connections alive across calls. The socket timeout bounds how long a
+    # hung API call can pin a worker thread before the retry layer sees it.
+    http = AuthorizedHttp(
+        creds, http=set_user_agent(httplib2.Http(timeout=10), "T-730 (gzip)")
+    )
+    return build(
+        "youtube", "v3", http=http, cache_discovery=False, static_discovery=True
+    )
+
+
+def _get_service():
+    """Return the process-wide YouTube client, building it on first use.
+
+    Rebuilding the discovery client per call re-parsed the API description
+    and opened a fresh connection each time; the singleton keeps one client
+    (and its keep-alive connections) for the life of the process. The
+    AuthorizedHttp transport refreshes its own credentials as needed.
+    """
+
+    global _SERVICE
+    service = _SERVICE
+    if service is not None:
+        return service
+    # call_with_retry runs sync helpers on worker threads, so the first
+    # build (and any rebuild after invalidation) must be serialized.
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = _build_service()
+        return _SERVICE
+
+
+# Membership answers rarely change, and when they do it is almost always
+# because this bot just inserted the video (which updates the cache below).
+# Positive answers are trusted longer than negative ones, since "not in the
+# playlist" can be invalidated by an insert from outside the bot.
+_EXISTS_POSITIVE_TTL_SECONDS = 600.0
+_EXISTS_NEGATIVE_TTL_SECONDS = 30.0
+_exists_cache: dict[tuple[str, str], tuple[bool, float]] = {}
 
 
 def video_exists(video_id: str, playlist_id: str) -> bool:
     """Return True if the given video_id is already in the playlist.
 
-    Paginates through playlist items safely, only including pageToken when
-    present to avoid API 400s from empty tokens.
+    Uses the API's server-side ``videoId`` filter so membership is a single
+    request regardless of playlist size. Falls back to a paginated scan if
+    the filtered query is rejected (HTTP 400). Answers are cached briefly
+    (longer for positives) to absorb repeat checks for the same video.
     """
 
+    key = (playlist_id, video_id)
+    cached = _exists_cache.get(key)
+    if cached is not None:
+        exists, expires = cached
+        if time.monotonic() < expires:
+            return exists
+        del _exists_cache[key]
+
     service = _get_service()
+    try:
+        res = (
+            service.playlistItems()
+            .list(
+                part="id",
+                playlistId=playlist_id,
+                videoId=video_id,
+                maxResults=1,
+                fields="items/id",
+            )
+            .execute()
+        )
+    except HttpError as e:
+        status = getattr(getattr(e, "resp", None), "status", None)
+        if status in (401, 403):
+            _invalidate_service()
+            raise CredentialsExpiredError(_reauth_hint()) from e
+        if status == 400:
+            exists = _video_exists_scan(service, video_id, playlist_id)
+        else:
+            raise RuntimeError(f"YouTube API error checking playlist: {e}") from e
+    else:
+        exists = bool(res.get("items"))
+
+    ttl = _EXISTS_POSITIVE_TTL_SECONDS if exists else _EXISTS_NEGATIVE_TTL_SECONDS
+    _exists_cache[key] = (exists, time.monotonic() + ttl)
+    return exists
+
+
+def _video_exists_scan(service, video_id: str, playlist_id: str) -> bool:
+    """Paginate through playlist items looking for ``video_id``.
+
+    Fallback for the filtered lookup in :func:`video_exists`; only includes
+    pageToken when present to avoid API 400s from empty tokens.
+    """
+
     playlist_items = service.playlistItems()
     page_token: Optional[str] = None
 
@@ -168,13 +407,16 @@ def video_exists(video_id: str, playlist_id: str) -> bool:
         except HttpError as e:
             status = getattr(getattr(e, "resp", None), "status", None)
             if status in (401, 403):
+                _invalidate_service()
                 raise CredentialsExpiredError(_reauth_hint()) from e
             raise RuntimeError(f"YouTube API error checking playlist: {e}") from e
 
-        if any(
-            it.get("contentDetails", {}).get("videoId") == video_id
+        page_ids = frozenset(
+            it["contentDetails"]["videoId"]
             for it in res.get("items", [])
-        ):
+            if "contentDetails" in it
+        )
+        if video_id in page_ids:
             return True
 
         page_token = res.get("nextPageToken")
@@ -182,6 +424,52 @@ def video_exists(video_id: str, playlist_id: str) -> bool:
             return False
 
 
+def _fetch_playlist_video_ids(playlist_id: str) -> frozenset:
+    """Return every video ID currently in the playlist via one full crawl.
+
+    Requests only the ``videoId`` field of each page to keep responses
+    small. Used by :mod:`bot.youtube.playlist_cache` to answer membership
+    checks from memory instead of one API round-trip per video.
+    """
+
+    service = _get_service()
+    playlist_items = service.playlistItems()
+    ids: set = set()
+    page_token: Optional[str] = None
+
+    while True:
+        params = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": 50,
+            "fields": "nextPageToken,items/contentDetails/videoId",
+        }
+        if page_token:
+            params["pageToken"] = page_token
+
+        try:
+            res = (
+                playlist_items
+                .list(**params)
+                .execute()
+            )
+        except HttpError as e:
+            status = getattr(getattr(e, "resp", None), "status", None)
+            if status in (401, 403):
+                _invalidate_service()
+                raise CredentialsExpiredError(_reauth_hint()) from e
+            raise RuntimeError(f"YouTube API error listing playlist: {e}") from e
+
+        for it in res.get("items", []):
+            vid = it.get("contentDetails", {}).get("videoId")
+            if vid:
+                ids.add(vid)
+
+        page_token = res.get("nextPageToken")
+        if not page_token:
+            return frozenset(ids)
+
+
 def add_to_playlist(video_id: str, playlist_id: str) -> dict:
     """Insert the given video into the playlist. Returns the API response.
 
@@ -199,51 +487,68 @@ def add_to_playlist(video_id: str, playlist_id: str) -> dict:
         }
     }
     try:
-        return (
+        response = (
             service.playlistItems()
-            .insert(part="snippet", body=body)
+            .insert(part="snippet", body=body, fields="id")
             .execute()
         )
     except HttpError as e:
         status = getattr(getattr(e, "resp", None), "status", None)
         if status in (401, 403):
+            _invalidate_service()
             raise CredentialsExpiredError(_reauth_hint()) from e
         raise RuntimeError(f"YouTube API error adding video: {e}") from e
 
+    # Write through: the video is now in the playlist, so later existence
+    # checks can answer from the cache without an API round-trip.
+    _exists_cache[(playlist_id, video_id)] = (
+        True,
+        time.monotonic() + _EXISTS_POSITIVE_TTL_SECONDS,
+    )
+    return response
+
+
+_ISO8601_DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
 
 def _parse_iso8601_duration(duration: str) -> int:
     """Parse a subset of ISO-8601 durations into total seconds."""
 
-    pattern = re.compile(
-        r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
-    )
-    match = pattern.match(duration)
+    match = _ISO8601_DURATION_RE.match(duration)
     if not match:
         raise ValueError(f"Unsupported ISO-8601 duration: {duration}")
 
-    parts = {k: int(v) if v else 0 for k, v in match.groupdict().items()}
-    total_seconds = (
-        parts["days"] * 24 * 3600
-        + parts["hours"] * 3600
-        + parts["minutes"] * 60
-        + parts["seconds"]
+    days, hours, minutes, seconds = (
+        int(g) if g else 0 for g in match.groups()
     )
-    return total_seconds
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
 
 
+@functools.lru_cache(maxsize=8192)
 def get_video_duration_seconds(video_id: str) -> int:
-    """Return the duration of a video in seconds."""
+    """Return the duration of a video in seconds.
+
+    Memoized: durations are immutable, so repeat lookups for a video ID
+    never hit the API again within a process.
+    """
 
     service = _get_service()
     try:
         response = (
             service.videos()
-            .list(part="contentDetails", id=video_id)
+            .list(
+                part="contentDetails",
+                id=video_id,
+                fields="items/contentDetails/duration",
+            )
             .execute()
         )
     except HttpError as e:
         status = getattr(getattr(e, "resp", None), "status", None)
         if status in (401, 403):
+            _invalidate_service()
             raise CredentialsExpiredError(_reauth_hint()) from e
         raise RuntimeError(f"YouTube API error fetching video details: {e}") from e
 
@@ -268,28 +573,77 @@ __all__ = [
     "add_to_playlist",
     "get_video_duration_seconds",
     "get_video_metadata",
+    "get_videos_metadata",
+    "credentials_refresh_loop",
     "CredentialsExpiredError",
     "MissingGoogleDependenciesError",
 ]
 
+# videos.list accepts at most 50 comma-joined IDs per request.
+_VIDEOS_LIST_MAX_IDS = 50
+
+# Response projection for metadata fetches: only what _metadata_from_item
+# reads, so the API strips tags, descriptions and localization blocks that
+# dominate the default payload.
+_METADATA_FIELDS = (
+    "items(id,snippet(title,channelTitle,thumbnails),contentDetails/duration)"
+)
+
+
+def _metadata_from_item(item: dict, *, video_id: str | None = None) -> dict:
+    """Build the metadata dict the bot uses from one ``videos.list`` item."""
+
+    snippet = item.get("snippet", {})
+    content = item.get("contentDetails", {})
+
+    duration_iso = content.get("duration") or "PT0S"
+    duration_seconds = _parse_iso8601_duration(duration_iso)
+
+    thumbs = (snippet.get("thumbnails") or {})
+    thumb = (
+        thumbs.get("maxres") or thumbs.get("standard") or
+        thumbs.get("high") or thumbs.get("medium") or thumbs.get("default") or {}
+    )
+
+    vid = video_id or item.get("id") or ""
+    return {
+        "id": vid,
+        "title": snippet.get("title") or vid,
+        "channel_title": snippet.get("channelTitle") or "",
+        "duration_seconds": duration_seconds,
+        "url": f"https://youtu.be/{vid}",
+        "thumbnail_url": thumb.get("url"),
+    }
+
 
+@functools.lru_cache(maxsize=8192)
 def get_video_metadata(video_id: str) -> dict:
     """Return basic metadata for a video.
 
     Includes: ``id``, ``title``, ``channel_title``, ``duration_seconds``,
-    ``url``, and ``thumbnail_url`` (best-effort).
+    ``url``, and ``thumbnail_url`` (best-effort). ``duration_seconds`` is
+    always an ``int``; callers may compare it without re-coercing.
+
+    Memoized per process; video titles change rarely enough that a stale
+    title in an announcement is an acceptable trade for skipping the API
+    round-trip. Callers must not mutate the returned dict.
     """
 
     service = _get_service()
     try:
         response = (
             service.videos()
-            .list(part="snippet,contentDetails", id=video_id)
+            .list(
+                part="snippet,contentDetails",
+                id=video_id,
+                fields=_METADATA_FIELDS,
+            )
             .execute()
         )
     except HttpError as e:
         status = getattr(getattr(e, "resp", None), "status", None)
         if status in (401, 403):
+            _invalidate_service()
             raise CredentialsExpiredError(_reauth_hint()) from e
         raise RuntimeError(f"YouTube API error fetching video details: {e}") from e
 
@@ -297,24 +651,44 @@ def get_video_metadata(video_id: str) -> dict:
     if not items:
         raise RuntimeError(f"Video {video_id} not found or has no metadata")
 
-    item = items[0]
-    snippet = item.get("snippet", {})
-    content = item.get("contentDetails", {})
+    return _metadata_from_item(items[0], video_id=video_id)
 
-    duration_iso = content.get("duration") or "PT0S"
-    duration_seconds = _parse_iso8601_duration(duration_iso)
 
-    thumbs = (snippet.get("thumbnails") or {})
-    thumb = (
-        thumbs.get("maxres") or thumbs.get("standard") or
-        thumbs.get("high") or thumbs.get("medium") or thumbs.get("default") or {}
-    )
+def get_videos_metadata(video_ids: Sequence[str]) -> dict:
+    """Return metadata for many videos keyed by ID, batching API calls.
 
-    return {
-        "id": video_id,
-        "title": snippet.get("title") or video_id,
-        "channel_title": snippet.get("channelTitle") or "",
-        "duration_seconds": duration_seconds,
-        "url": f"https://youtu.be/{video_id}",
-        "thumbnail_url": thumb.get("url"),
-    }
+    Issues one ``videos.list`` request per 50 IDs instead of one per video.
+    IDs the API does not return (deleted/private videos) are simply absent
+    from the result, so callers should treat missing keys as failures.
+    """
+
+    if not video_ids:
+        return {}
+
+    service = _get_service()
+    results: dict[str, dict] = {}
+    for start in range(0, len(video_ids), _VIDEOS_LIST_MAX_IDS):
+        chunk = video_ids[start:start + _VIDEOS_LIST_MAX_IDS]
+        try:
+            response = (
+                service.videos()
+                .list(
+                    part="snippet,contentDetails",
+                    id=",".join(chunk),
+                    fields=_METADATA_FIELDS,
+                )
+                .execute()
+            )
+        except HttpError as e:
+            status = getattr(getattr(e, "resp", None), "status", None)
+            if status in (401, 403):
+                _invalidate_service()
+                raise CredentialsExpiredError(_reauth_hint()) from e
+            raise RuntimeError(f"YouTube API error fetching video details: {e}") from e
+
+        for item in response.get("items", []):
+            meta = _metadata_from_item(item)
+            if meta["id"]:
+                results[meta["id"]] = meta
+
+    return results
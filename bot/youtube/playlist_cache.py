@@ -0,0 +1,85 @@
+"""Short-lived in-memory cache of playlist membership.
+
+``/addradio`` used to issue one ``playlistItems.list`` round-trip per
+submitted video just to answer "is it already in the playlist?". Fetching
+the full video-id set once and holding it for a few seconds turns those
+checks into set lookups, and a per-playlist lock coalesces concurrent
+callers so a burst of invocations triggers at most one crawl
+(single-flight).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from . import _fetch_playlist_video_ids
+from ..retry import call_with_retry
+
+_DEFAULT_TTL_SECONDS = 30.0
+
+_cache: dict = {}
+_locks: dict = {}
+
+
+def _lock_for(playlist_id: str) -> asyncio.Lock:
+    lock = _locks.get(playlist_id)
+    if lock is None:
+        lock = _locks.setdefault(playlist_id, asyncio.Lock())
+    return lock
+
+
+async def get_playlist_video_ids(
+    playlist_id: str, *, ttl: float = _DEFAULT_TTL_SECONDS
+) -> frozenset:
+    """Return the playlist's video IDs, cached for ``ttl`` seconds.
+
+    Concurrent callers for the same playlist share a single in-flight
+    crawl; everyone else waits on the lock and reads the freshly cached
+    set.
+    """
+
+    entry = _cache.get(playlist_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    async with _lock_for(playlist_id):
+        # Re-check after waiting: another caller may have refreshed.
+        entry = _cache.get(playlist_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        ids = await call_with_retry(
+            _fetch_playlist_video_ids,
+            playlist_id,
+            description=f"list playlist {playlist_id}",
+        )
+        _cache[playlist_id] = (time.monotonic() + ttl, ids)
+        return ids
+
+
+def record_added(playlist_id: str, video_id: str) -> None:
+    """Fold a just-inserted video into the cached membership set.
+
+    Write-through keeps the cache accurate for our own inserts without
+    shortening the TTL or re-crawling the playlist: the entry's expiry is
+    left untouched and only the set gains the new ID.
+    """
+
+    entry = _cache.get(playlist_id)
+    if entry is None:
+        return
+    expires, ids = entry
+    if video_id not in ids:
+        _cache[playlist_id] = (expires, ids | {video_id})
+
+
+def invalidate(playlist_id: str | None = None) -> None:
+    """Drop cached membership for one playlist, or all of them."""
+
+    if playlist_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(playlist_id, None)
+
+
+__all__ = ["get_playlist_video_ids", "record_added", "invalidate"]
@@ -6,16 +6,56 @@ Handles common URL variants and strips extra parameters. Only returns valid
 
 from __future__ import annotations
 
+import functools
 import re
-from typing import Iterable, List, Optional
-from urllib.parse import parse_qs, urlparse
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
 
-_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_ID_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+)
+
+
+def _is_valid_id(s: Optional[str]) -> bool:
+    """Return True for an 11-char string over the video-ID alphabet.
+
+    Replaces a regex fullmatch: the length check plus set containment is
+    cheaper than regex dispatch for this fixed-width validator, which runs
+    for every candidate URL branch.
+    """
+
+    return s is not None and len(s) == 11 and all(c in _ID_CHARS for c in s)
+
+# Compiled once: these run on every /addradio invocation. One alternation
+# finds both explicit http(s) URLs and bare youtube links in a single pass,
+# yielding candidates in document order.
+_COMMA_RE = re.compile(r",[\s]*")
+_CAND_RE = re.compile(
+    r"(?:https?://|(?:www\.)?(?:youtube\.com|youtu\.be)/)[^\s<>]+",
+    re.IGNORECASE,
+)
+
+
+def _extract_v_param(query: str) -> Optional[str]:
+    """Return the first ``v`` parameter from a query string, if any.
+
+    Replaces ``parse_qs`` on this path: we need exactly one key, and video
+    IDs contain no percent-escapes, so building the full multi-dict (with
+    unquoting of every parameter) is wasted work.
+    """
+
+    for pair in query.split("&"):
+        if pair.startswith("v="):
+            return pair[2:] or None
+    return None
+
+
+_STRIP_CHARS = ")],.>\n\r\t "
 
 
 def _clean_url_token(tok: str) -> str:
     """Strip trailing punctuation commonly stuck to URLs in chat."""
-    return tok.rstrip(")],.>\n\r\t ")
+    return tok.rstrip(_STRIP_CHARS)
 
 
 def _extract_video_id_from_url(url: str) -> Optional[str]:
@@ -32,48 +72,57 @@ def _extract_video_id_from_url(url: str) -> Optional[str]:
     # youtu.be/<id>
     if host.endswith("youtu.be"):
         vid = p.path.lstrip("/").split("/")[0]
-        return vid if _ID_RE.match(vid or "") else None
+        return vid if _is_valid_id(vid) else None
 
     # youtube.com/watch?v=<id>
     if p.path == "/watch":
-        vid = parse_qs(p.query).get("v", [None])[0]
-        return vid if _ID_RE.match(vid or "") else None
+        vid = _extract_v_param(p.query)
+        return vid if _is_valid_id(vid) else None
 
     # shorts, embed, v, live: first path segment after the prefix is the id
     for prefix in ("/shorts/", "/embed/", "/v/", "/live/"):
         if p.path.startswith(prefix):
             vid = p.path[len(prefix):].split("/")[0]
-            return vid if _ID_RE.match(vid or "") else None
+            return vid if _is_valid_id(vid) else None
 
     # Fallback: any v param even on other paths
-    vid = parse_qs(p.query).get("v", [None])[0]
-    return vid if _ID_RE.match(vid or "") else None
+    vid = _extract_v_param(p.query)
+    return vid if _is_valid_id(vid) else None
 
 
 def canonical_video_ids_from_text(text: str) -> List[str]:
     """Return ordered unique list of 11-char video IDs found in text.
 
     Parses URLs and extracts IDs from common YouTube URL variants. Accepts
-    scheme-less inputs like ``youtube.com/watch?v=...`` as well.
+    scheme-less inputs like ``youtube.com/watch?v=...`` as well. Parsing is
+    pure, so results are memoized per input string — reposts of the same
+    link skip the scan entirely.
     """
 
-    # Treat commas as delimiters between potential URLs to support comma-separated lists.
-    normalized_text = re.sub(r",[\s]*", " ", text)
+    return list(_cached_video_ids(text))
+
 
-    # Find explicit http(s) URLs first
-    candidates = list(re.findall(r"https?://[^\s<>]+", normalized_text))
+@functools.lru_cache(maxsize=1024)
+def _cached_video_ids(text: str) -> Tuple[str, ...]:
+    # Every accepted host contains "youtu"; text without it can't yield an
+    # ID, so skip the regex passes entirely for plain chatter.
+    if "youtu" not in text and "YOUTU" not in text.upper():
+        return ()
+
+    # Treat commas as delimiters between potential URLs to support comma-separated lists.
+    normalized_text = _COMMA_RE.sub(" ", text)
 
-    # Also accept bare youtube links without scheme (e.g., youtube.com/... or youtu.be/...)
-    bare_matches = re.findall(
-        r"(?:(?:www\.)?(?:youtube\.com|youtu\.be)/[^\s<>]+)",
-        normalized_text,
-        flags=re.IGNORECASE,
-    )
-    candidates.extend(bare_matches)
+    # One scan catches explicit http(s) URLs and scheme-less youtube links
+    # (e.g., youtube.com/... or youtu.be/...) alike.
+    candidates = _CAND_RE.findall(normalized_text)
 
     seen = set()
     out: List[str] = []
     for cand in candidates:
+        # Unrelated https links (Spotify, Twitter, ...) are common in chat;
+        # skip the urlparse work for anything that can't be a YouTube host.
+        if "youtu" not in cand.lower():
+            continue
         url = _clean_url_token(cand)
         # Normalize scheme-less links to https for parsing
         if "://" not in url:
@@ -82,7 +131,7 @@ def canonical_video_ids_from_text(text: str) -> List[str]:
         if vid and vid not in seen:
             seen.add(vid)
             out.append(vid)
-    return out
+    return tuple(out)
 
 
 __all__ = [
@@ -1,23 +1,22 @@
-from bot.config import _bool_from_env
-
-
-def test_bool_from_env_truthy(monkeypatch):
-    monkeypatch.setenv("FEATURE_FLAG", "true")
-
-    assert _bool_from_env("FEATURE_FLAG", default=False) is True
+import pytest
 
-
-def test_bool_from_env_falsey(monkeypatch):
-    monkeypatch.setenv("FEATURE_FLAG", "OFF")
-
-    assert _bool_from_env("FEATURE_FLAG", default=True) is False
+from bot.config import _bool_from_env
 
 
-def test_bool_from_env_invalid_logs_warning(monkeypatch, caplog):
-    monkeypatch.setenv("FEATURE_FLAG", "maybe")
+@pytest.mark.parametrize(
+    "env_val,default,expected,expect_warning",
+    [
+        ("true", False, True, False),
+        ("OFF", True, False, False),
+        ("maybe", True, True, True),
+    ],
+)
+def test_bool_from_env(monkeypatch, caplog, env_val, default, expected, expect_warning):
+    monkeypatch.setenv("FEATURE_FLAG", env_val)
 
     with caplog.at_level("WARNING"):
-        result = _bool_from_env("FEATURE_FLAG", default=True)
+        result = _bool_from_env("FEATURE_FLAG", default=default)
 
-    assert result is True
-    assert any("not a recognized boolean" in message for message in caplog.messages)
+    assert result is expected
+    warned = any("not a recognized boolean" in message for message in caplog.messages)
+    assert warned is expect_warning
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from bot.youtube import playlist_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    playlist_cache.invalidate()
+    yield
+    playlist_cache.invalidate()
+
+
+@pytest.mark.asyncio
+async def test_membership_is_cached_within_ttl(monkeypatch):
+    calls = 0
+
+    def fake_fetch(playlist_id):
+        nonlocal calls
+        calls += 1
+        return frozenset({"AAAAAAA1111", "BBBBBBB2222"})
+
+    monkeypatch.setattr(playlist_cache, "_fetch_playlist_video_ids", fake_fetch)
+
+    first = await playlist_cache.get_playlist_video_ids("pl123")
+    second = await playlist_cache.get_playlist_video_ids("pl123")
+
+    assert first == second == {"AAAAAAA1111", "BBBBBBB2222"}
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_refetched(monkeypatch):
+    calls = 0
+
+    def fake_fetch(playlist_id):
+        nonlocal calls
+        calls += 1
+        return frozenset({"AAAAAAA1111"})
+
+    monkeypatch.setattr(playlist_cache, "_fetch_playlist_video_ids", fake_fetch)
+
+    await playlist_cache.get_playlist_video_ids("pl123", ttl=0.0)
+    await playlist_cache.get_playlist_video_ids("pl123", ttl=0.0)
+
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch(monkeypatch):
+    calls = 0
+
+    def slow_fetch(playlist_id):
+        nonlocal calls
+        calls += 1
+        time.sleep(0.02)
+        return frozenset({"AAAAAAA1111"})
+
+    monkeypatch.setattr(playlist_cache, "_fetch_playlist_video_ids", slow_fetch)
+
+    results = await asyncio.gather(
+        playlist_cache.get_playlist_video_ids("pl123"),
+        playlist_cache.get_playlist_video_ids("pl123"),
+    )
+
+    assert results[0] == results[1] == {"AAAAAAA1111"}
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_record_added_updates_cache_without_refetch(monkeypatch):
+    calls = 0
+
+    def fake_fetch(playlist_id):
+        nonlocal calls
+        calls += 1
+        return frozenset({"AAAAAAA1111"})
+
+    monkeypatch.setattr(playlist_cache, "_fetch_playlist_video_ids", fake_fetch)
+
+    await playlist_cache.get_playlist_video_ids("pl123")
+    playlist_cache.record_added("pl123", "CCCCCCC3333")
+    ids = await playlist_cache.get_playlist_video_ids("pl123")
+
+    assert ids == {"AAAAAAA1111", "CCCCCCC3333"}
+    assert calls == 1
@@ -22,12 +22,13 @@ async def test_retry_helper_retries_then_succeeds(monkeypatch):
         sleeps.append(delay)
 
     monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(retry.random, "uniform", lambda a, b: 1.0)
 
     result = await retry.call_with_retry(flaky_call, description="flaky call")
 
     assert result == "ok"
     assert attempts == 4
-    assert sleeps[:3] == [5, 5, 5]
+    assert sleeps[:3] == [1, 2, 4]
 
 
 @pytest.mark.asyncio
@@ -46,9 +47,38 @@ async def test_retry_helper_eventually_stops(monkeypatch):
         sleeps.append(delay)
 
     monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(retry.random, "uniform", lambda a, b: 1.0)
 
     with pytest.raises(RuntimeError):
         await retry.call_with_retry(always_fail, description="always fail")
 
     assert attempts == len(retry.RETRY_WAIT_SECONDS)
-    assert sleeps[-3:] == [60, 300, 600]
+    assert sleeps[-3:] == [16, 32, 64]
+
+
+@pytest.mark.asyncio
+async def test_permanent_http_errors_are_not_retried(monkeypatch):
+
+    class FakeResp:
+        status = 404
+
+    class FakeHttpError(Exception):
+        resp = FakeResp()
+
+    attempts = 0
+
+    def not_found():
+        nonlocal attempts
+        attempts += 1
+        # Mirror how the YouTube helpers wrap HttpError.
+        raise RuntimeError("YouTube API error") from FakeHttpError("404")
+
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+
+    with pytest.raises(RuntimeError):
+        await retry.call_with_retry(not_found, description="not found")
+
+    assert attempts == 1
@@ -26,7 +26,7 @@ def make_service(pages=None, insert_behavior=None, video_response=None):
 
             return Exec(self)
 
-        def insert(self, part=None, body=None):
+        def insert(self, part=None, body=None, **params):
             class Exec:
                 def execute(self_inner):
                     if isinstance(insert_behavior, Exception):
@@ -53,24 +53,39 @@ def make_service(pages=None, insert_behavior=None, video_response=None):
     return Service()
 
 
-def test_video_exists_found(monkeypatch):
+def test_video_exists_uses_filtered_lookup(monkeypatch):
     from bot import youtube as yt
 
-    # Page contains target id
-    pages = [
-        {
-            "items": [
-                {"contentDetails": {"videoId": "foo"}},
-                {"contentDetails": {"videoId": "target"}},
-            ]
-        }
-    ]
-
+    # The filtered query returns a (possibly empty) single-item page.
+    pages = [{"items": [{"id": "playlistItemId"}]}]
     monkeypatch.setattr(yt, "_get_service", lambda: make_service(pages=pages))
     assert yt.video_exists("target", "playlist123") is True
 
+    pages = [{"items": []}]
+    monkeypatch.setattr(yt, "_get_service", lambda: make_service(pages=pages))
+    assert yt.video_exists("missing", "playlist123") is False
+
 
-def test_video_exists_not_found_with_pagination(monkeypatch):
+def test_video_exists_answers_repeat_checks_from_cache(monkeypatch):
+    from bot import youtube as yt
+
+    monkeypatch.setattr(yt, "_exists_cache", {})
+
+    calls = 0
+
+    def get_service():
+        nonlocal calls
+        calls += 1
+        return make_service(pages=[{"items": [{"id": "playlistItemId"}]}])
+
+    monkeypatch.setattr(yt, "_get_service", get_service)
+
+    assert yt.video_exists("cachedVid123", "playlist123") is True
+    assert yt.video_exists("cachedVid123", "playlist123") is True
+    assert calls == 1
+
+
+def test_video_exists_scan_fallback_paginates():
     from bot import youtube as yt
 
     pages = [
@@ -87,8 +102,8 @@ def test_video_exists_not_found_with_pagination(monkeypatch):
         },
     ]
 
-    monkeypatch.setattr(yt, "_get_service", lambda: make_service(pages=pages))
-    assert yt.video_exists("missing", "playlist123") is False
+    service = make_service(pages=pages)
+    assert yt._video_exists_scan(service, "missing", "playlist123") is False
 
 
 def test_add_to_playlist_success(monkeypatch):
@@ -118,6 +133,53 @@ def test_add_to_playlist_wraps_http_error(monkeypatch):
     assert "YouTube API error adding video" in str(ei.value)
 
 
+def test_fetch_playlist_video_ids_paginates(monkeypatch):
+    from bot import youtube as yt
+
+    pages = [
+        {
+            "items": [{"contentDetails": {"videoId": "a"}}],
+            "nextPageToken": "next",
+        },
+        {
+            "items": [{"contentDetails": {"videoId": "b"}}]
+        },
+    ]
+
+    monkeypatch.setattr(yt, "_get_service", lambda: make_service(pages=pages))
+    assert yt._fetch_playlist_video_ids("playlist123") == {"a", "b"}
+
+
+def test_get_videos_metadata_batches_ids(monkeypatch):
+    from bot import youtube as yt
+
+    service = make_service(
+        video_response={
+            "items": [
+                {
+                    "id": "vidAAAAAAA1",
+                    "snippet": {"title": "First", "channelTitle": "Chan"},
+                    "contentDetails": {"duration": "PT2M"},
+                },
+                {
+                    "id": "vidBBBBBBB2",
+                    "snippet": {"title": "Second", "channelTitle": "Chan"},
+                    "contentDetails": {"duration": "PT10M1S"},
+                },
+            ]
+        }
+    )
+
+    monkeypatch.setattr(yt, "_get_service", lambda: service)
+
+    metas = yt.get_videos_metadata(["vidAAAAAAA1", "vidBBBBBBB2", "vidMISSING3"])
+
+    assert set(metas) == {"vidAAAAAAA1", "vidBBBBBBB2"}
+    assert metas["vidAAAAAAA1"]["duration_seconds"] == 120
+    assert metas["vidBBBBBBB2"]["title"] == "Second"
+    assert "vidMISSING3" not in metas
+
+
 def test_get_video_duration_seconds(monkeypatch):
     from bot import youtube as yt
 